@@ -6,11 +6,13 @@
 import pytest
 
 from yabs.util import (
+    BoundedSink,
     assert_always,
     check_arg,
     format_elap,
     format_rate,
     get_dict_attr,
+    get_format_field_names,
     progress_bar_str,
     shorten_string,
 )
@@ -86,6 +88,32 @@ class TestBasics:
         assert get_dict_attr(d, "foobar", "def") == "def"
         assert get_dict_attr(d, "d1.foobar", "def") == "def"
 
+    def test_get_format_field_names(self):
+        assert get_format_field_names("") == set()
+        assert get_format_field_names("v{version}") == {"version"}
+        assert get_format_field_names("{{escaped}} {repo}/{tag_name}") == {
+            "repo",
+            "tag_name",
+        }
+        assert get_format_field_names("{version.major} {artifacts[sdist]}") == {
+            "version",
+            "artifacts",
+        }
+
+    def test_bounded_sink(self):
+        sink = BoundedSink(max_bytes=10)
+        assert sink.tail_text() == ""
+        sink.write(b"abc")
+        sink.write(b"")
+        assert sink.tail_bytes() == b"abc"
+        assert not sink.truncated
+        for _ in range(10):
+            sink.write(b"0123")
+        assert sink.total_bytes == 43
+        assert sink.truncated
+        assert sink.tail_bytes() == b"2301230123"
+        assert sink.tail_text() == "[... 33 bytes skipped]\n2301230123"
+
     def test_shorten_string(self):
         s = (
             "Do you see any Teletubbies in here?"
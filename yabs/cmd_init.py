@@ -11,6 +11,9 @@ from jinja2 import Environment, PackageLoader, select_autoescape
 
 from .util import datetime_to_iso
 
+#: Lazily created Jinja2 environment, see `_get_env()`
+_JINJA_ENV = None
+
 
 def handle_init_command(parser: ArgumentParser, args: Namespace):
     res = run(parser, args)
@@ -54,12 +57,20 @@ def run(parser: ArgumentParser, args: Namespace):
     _copy_template(f"yabs-{file_type}.yaml", target, context)
 
 
+def _get_env() -> Environment:
+    """Return a shared Jinja2 environment (keeps compiled templates cached)."""
+    global _JINJA_ENV
+    if _JINJA_ENV is None:
+        _JINJA_ENV = Environment(
+            loader=PackageLoader("yabs"),  # defaults to 'templates' folder
+            autoescape=select_autoescape(),
+            auto_reload=False,
+        )
+    return _JINJA_ENV
+
+
 def _copy_template(tmpl_name: str, target: Path, ctx: dict) -> None:
-    env = Environment(
-        loader=PackageLoader("yabs"),  # defaults to 'templates' folder
-        autoescape=select_autoescape(),
-    )
-    template = env.get_template(tmpl_name)
+    template = _get_env().get_template(tmpl_name)
     expanded = template.render(**ctx)
     # logger.info("Writing {:,} bytes to {!r}...".format(len(tmpl), target_path))
     with target.open("wt") as fp:
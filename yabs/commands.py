@@ -4,14 +4,16 @@
 """
 """
 from argparse import ArgumentParser, Namespace
+from concurrent.futures import ThreadPoolExecutor
 
-import requests
-
-from yabs.task.common import REQUESTS_HEADERS, TaskContext
+from yabs.task.common import TaskContext, get_requests_session
 from yabs.task_runner import TaskRunner
 
 from .util import log_error, log_info, log_warning, write
 
+#: Timeout in seconds for the URL probes of the `info` command
+PROBE_TIMEOUT = 5
+
 
 def handle_run_command(parser: ArgumentParser, args: Namespace):
     tm = TaskRunner(args.workflow, parser, args)
@@ -41,22 +43,15 @@ def handle_info_command(parser: ArgumentParser, args: Namespace):
     write("git status", output=res)
     log_info("")
 
-    url = f"https://github.com/{context.repo}/releases/tag/{context.org_tag_name}"
-    try:
-        resp = requests.get(url, verify=False, headers=REQUESTS_HEADERS)
-        resp.raise_for_status()
-        log_info(f"GitHub URL: {url}")
-    except Exception as e:
-        log_warning(f"GitHub URL: {e}")
-
-    url = f"https://pypi.org/project/{context.repo_short}/"
-    try:
-        resp = requests.get(url, verify=False, headers=REQUESTS_HEADERS)
-        resp.raise_for_status()
-        log_info(f"PyPI URL:   {url}")
-    except Exception as e:
-        log_warning(f"PyPI URL:   {e}")
-
+    # (label, url, hint) tuples
+    probes = [
+        (
+            "GitHub URL:",
+            f"https://github.com/{context.repo}/releases/tag/{context.org_tag_name}",
+            None,
+        ),
+        ("PyPI URL:  ", f"https://pypi.org/project/{context.repo_short}/", None),
+    ]
     wgr_inst = tr.get_first_task_instance("winget_release")
     if wgr_inst:
         package_id = wgr_inst.task_def.get("package_id", "")
@@ -64,14 +59,30 @@ def handle_info_command(parser: ArgumentParser, args: Namespace):
         wpm_version = f"{context.org_tag_name}.0".lstrip("v")
         char0 = context.repo[0]
         url = f"https://github.com/microsoft/winget-pkgs/tree/master/manifests/{char0}/{package_path_part}/{wpm_version}"
+        probes.append(
+            ("WPM URL:   ", url, "            (Note: package_id is case sensitive)")
+        )
+
+    def _probe(url):
+        # HEAD is enough to check existence (we don't need the HTML body)
+        resp = get_requests_session().head(
+            url, verify=False, allow_redirects=True, timeout=PROBE_TIMEOUT
+        )
+        resp.raise_for_status()
+
+    # Run the requests concurrently, but log results in a stable order
+    with ThreadPoolExecutor(max_workers=len(probes)) as ex:
+        futures = [ex.submit(_probe, url) for _label, url, _hint in probes]
+    for (label, url, hint), fut in zip(probes, futures):
         try:
-            resp = requests.get(url, verify=False, headers=REQUESTS_HEADERS)
-            resp.raise_for_status()
-            log_info(f"WPM URL:    {url}")
+            fut.result()
+            log_info(f"{label} {url}")
         except Exception as e:
-            log_warning(f"WPM URL:    {e}")
-            log_warning("            (Note: package_id is case sensitive)")
-    else:
+            log_warning(f"{label} {e}")
+            if hint:
+                log_warning(hint)
+
+    if not wgr_inst:
         log_info("`winget_release` is not configured.")
 
     log_info("")
@@ -3,9 +3,14 @@
 # Licensed under the MIT license: https://www.opensource.org/licenses/mit-license.php
 """
 """
+import hashlib
+import json
+import logging
+import os
+import sys
+from importlib.metadata import EntryPoint, entry_points
 from inspect import isclass
-
-from pkg_resources import iter_entry_points
+from typing import List, Tuple
 
 from .task.build import BuildTask
 from .task.bump import BumpTask
@@ -18,11 +23,84 @@ from .task.push import PushTask
 from .task.pypi_release import PypiReleaseTask
 from .task.tag import TagTask
 from .task.winget_release import WingetReleaseTask
-from .util import log_debug, log_warning, logger
+from .util import get_user_cache_dir, log_debug, log_warning, logger
 
 # from semantic_version import Version
 
 
+def _iter_entry_points(group: str):
+    """Return entry points of `group` (uses the fast stdlib implementation)."""
+    if sys.version_info >= (3, 10):
+        return entry_points(group=group)
+    return entry_points().get(group, [])
+
+
+#: Cache file (in `get_user_cache_dir()`) for discovered plugin entry points.
+#: Set the `YABS_NO_EP_CACHE` environment variable to disable the cache.
+EP_CACHE_NAME = "entry_points.json"
+
+
+def _get_sys_path_key() -> str:
+    """Return a hash of the Python version and the mtimes of `sys.path` entries.
+
+    Installing or removing a distribution modifies its site-packages folder,
+    so this invalidates the cache.
+    """
+    parts = [sys.version]
+    for p in sys.path:
+        try:
+            parts.append(f"{p}:{os.stat(p or '.').st_mtime_ns}")
+        except OSError:
+            continue
+    return hashlib.md5("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+def _find_entry_points(group: str) -> List[Tuple[EntryPoint, str]]:
+    """Return a list of `(entry_point, plugin_name)` tuples for `group`.
+
+    Results are cached on disk, because scanning all installed distributions
+    is a significant part of the CLI startup time.
+    """
+    use_cache = not os.environ.get("YABS_NO_EP_CACHE")
+    cache_path = get_user_cache_dir() / EP_CACHE_NAME
+    key = _get_sys_path_key()
+
+    if use_cache:
+        try:
+            with cache_path.open("rt") as fp:
+                cache = json.load(fp)
+            if cache["key"] == key and cache["group"] == group:
+                log_debug(f"Using cached entry points from {cache_path}")
+                return [
+                    (EntryPoint(name, value, group), plugin_name)
+                    for name, value, plugin_name in cache["entry_points"]
+                ]
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+    res = []
+    for ep in _iter_entry_points(group):
+        dist = getattr(ep, "dist", None)  # Python 3.10+
+        plugin_name = f"{dist.name} {dist.version}" if dist else ep.value
+        res.append((ep, plugin_name))
+
+    if use_cache:
+        cache = {
+            "key": key,
+            "group": group,
+            "entry_points": [[ep.name, ep.value, pn] for ep, pn in res],
+        }
+        tmp_path = cache_path.with_suffix(".tmp")
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with tmp_path.open("wt") as fp:
+                json.dump(cache, fp)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            log_debug(f"Could not write {cache_path}: {e}")
+    return res
+
+
 class PluginManager:
     """
     Load, cache, and maintain a list of plugins and workflow tasks.
@@ -65,19 +143,21 @@ class PluginManager:
         ep_map = cls._entry_point_map
         log_debug(f"Search entry points for group '{cls.namespace}'...")
 
-        for ep in iter_entry_points(group=cls.namespace, name=None):
-            plugin_name = f"{ep.dist}"
+        reserved = set(cls.task_class_map)
+        seen = set(ep_map)
+        for ep, plugin_name in _find_entry_points(cls.namespace):
             log_debug(f"Found plugin {plugin_name} from entry point `{ep}`")
 
-            if ep.name in ep_map:
+            if ep.name in seen:
                 log_warning(f"Duplicate entry point name: {ep.name}; skipping...")
                 continue
-            elif ep.name in cls.task_class_map:
+            elif ep.name in reserved:
                 # TODO: support overriding standard tasks?
                 # Maybe when 'exreas=[override]' is passed...
                 log_warning(f"Plugin task name already exists: {ep.name}; skipping...")
                 continue
 
+            seen.add(ep.name)
             ep_map[ep.name] = ep
 
         return
@@ -91,41 +171,67 @@ class PluginManager:
         cls.find_plugins()
 
         ep_map = cls._entry_point_map
-        for name, ep in cls._entry_point_map.items():
-            log_debug(f"Load plugin {ep.dist}...")
+        #: (msg, exc_info) tuples, logged after all plugins were processed
+        failures = []
+        # Iterate over a copy, since we replace the values with the loaded functions
+        for name, ep in list(ep_map.items()):
+            log_debug(f"Load plugin {ep.value}...")
             try:
                 register_fn = ep.load()
                 if not callable(register_fn):
                     raise RuntimeError(f"Entry point {ep} is not a function.")
                 ep_map[ep.name] = register_fn
             except Exception:
-                logger.exception(f"Failed to load {ep}.")
+                failures.append((f"Failed to load {ep}", sys.exc_info()))
+                continue
 
-            log_debug(f"Register plugin {ep.dist}...")
+            log_debug(f"Register plugin {ep.value}...")
             try:
                 plugin = register_fn(task_base=WorkflowTask)
             except Exception:
-                logger.exception(f"Could not register {name}")
+                failures.append((f"Could not register {name}", sys.exc_info()))
                 continue
             # Some checks
-            if issubclass(plugin, WorkflowTask):
+            if not isclass(plugin):
+                failures.append(
+                    (f"Plugin.register {name} did not return a class: {plugin}", None)
+                )
+                continue
+            elif issubclass(plugin, WorkflowTask):
                 # Rely on ABC interface
                 pass
-            elif not isclass(plugin):
-                logger.error(f"Plugin.register {name} did not return a class: {plugin}")
             else:
                 # Do some interface checks
                 if getattr(plugin, "name", None) != name:
                     raise RuntimeError("Plugin must contain `name`")
             cls.task_class_map[name] = plugin
+
+        # Formatting tracebacks is expensive and only useful in verbose mode
+        verbose = logger.isEnabledFor(logging.DEBUG)
+        for msg, exc_info in failures:
+            if exc_info and verbose:
+                logger.error(msg, exc_info=exc_info)
+            elif exc_info:
+                logger.error(f"{msg}: {exc_info[1]!r}")
+            else:
+                logger.error(msg)
         return
 
     @classmethod
     def register_cli_commands(cls, subparsers, parents, run_parser):
         # Load entry-point and call register() for plugins.
         cls.register_plugins()
-        # We assume that plugins have declared classes that derrived from
-        # WorkflowTask
-        for task_cls in WorkflowTask.__subclasses__():
+        # `task_class_map` is the authoritative list of core and plugin tasks.
+        # Plugin classes that are not derived from WorkflowTask may not
+        # implement `register_cli_command()`.
+        # NOTE: every call receives a new parser, so don't skip classes that
+        # were registered by previous calls (only aliases in this call).
+        seen = set()
+        for task_cls in cls.task_class_map.values():
+            if task_cls in seen:
+                continue
+            seen.add(task_cls)
+            if not hasattr(task_cls, "register_cli_command"):
+                continue
             logger.debug(f"Register {task_cls}")
             task_cls.register_cli_command(subparsers, parents, run_parser)
@@ -3,18 +3,19 @@
 # Licensed under the MIT license: https://www.opensource.org/licenses/mit-license.php
 """
 """
+import re
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 from ..util import (
     ConfigError,
     FolderContentMonitor,
-    check_arg,
     log_debug,
     log_error,
     log_info,
     log_warning,
 )
+from ..util import plural_s as ps
 from .common import TaskContext, WorkflowTask
 
 if TYPE_CHECKING:  # Imported by type checkers, but prevent circular includes
@@ -28,14 +29,21 @@ class BuildTask(WorkflowTask):
         "targets": ["sdist", "bdist_wheel"],
     }
     MANDATORY_OPTS = None
+    #: Match the artifact file names that `setup.py TARGET` creates
+    TARGET_PATTERNS = {
+        "sdist": re.compile(r".*\.tar\.gz$"),
+        "bdist_wheel": re.compile(r".*\.whl$"),
+    }
+    OPT_TYPES = {
+        "clean": bool,
+        "revert_bump_on_error": bool,
+        "targets": list,
+    }
 
     def __init__(self, task_inst: "TaskInstance"):
         super().__init__(task_inst)
 
         opts = self.opts
-        check_arg(opts["clean"], bool)
-        check_arg(opts["revert_bump_on_error"], bool)
-        check_arg(opts["targets"], list)
 
         unknown = set(opts["targets"]).difference(self.KNOWN_TARGETS)
         if unknown:
@@ -69,7 +77,7 @@ class BuildTask(WorkflowTask):
             extra_args.append("--quiet")
 
         # Check if setup.py really uses the expected name & version
-        setup_info = self.get_setup_metadata(extra_args)
+        setup_info = self.get_setup_metadata(extra_args, context=context)
         real_name = setup_info["name"]
         real_version = setup_info["version"]
         # ret_code, real_version = self._exec(
@@ -80,34 +88,44 @@ class BuildTask(WorkflowTask):
         if real_version != str(context.version):
             if not self.dry_run:
                 raise RuntimeError(
-                    f"`setup.py --version` returned {real_version!r} (expected {context.version!r})"
+                    f"`{setup_info['source']}` returned {real_version!r} (expected {context.version!r})"
                 )
 
         targets = self.opts["targets"]
         dist_dir = Path("dist").absolute()
 
-        matches = {}
-        if "sdist" in targets:
-            matches["sdist"] = r".*\.tar\.gz"
-        if "bdist_wheel" in targets:
-            matches["bdist_wheel"] = r".*\.whl"
         if "bdist_msi" in targets:
             raise RuntimeError("Define a separate 'exec' task' to create MSIs")
+        matches = {t: self.TARGET_PATTERNS[t] for t in targets}
 
         artifacts_def = {
             "folder": dist_dir,
             "matches": matches,
         }
         ok = True
+        # Run all setup.py commands in one process, to pay the Python and
+        # setuptools startup costs only once
+        args = ["python", "setup.py"] + extra_args
+        for target in targets:
+            args += [target, "--dist-dir", str(dist_dir)]
+        if opts["clean"]:
+            args += ["clean", "--all"]
+
         with FolderContentMonitor(artifacts_def) as fcm:
-            for target in targets:
-                log_info(f"Building {target} for {real_name} {real_version}...")
-                ret_code, _out = self._exec(
-                    ["python", "setup.py", target, "--dist-dir", str(dist_dir)]
-                    + extra_args
+            log_info(f"Building {', '.join(targets)} for {real_name} {real_version}...")
+            ret_code, _out = self._exec(args)
+            if ret_code != 0:
+                ok = False
+
+        if not ok:
+            # setup.py stops at the first failing command, so later targets
+            # are not built either
+            missing = [t for t in targets if t not in fcm.changed_or_added_by_tag]
+            log_error(
+                "`setup.py` failed: target{} {} not built.".format(
+                    ps(missing), ", ".join(missing) or "(unknown)"
                 )
-                if ret_code != 0:
-                    ok = False
+            )
 
         if fcm.changed_or_added_files:
             # log_info(f"Created artifacts: {fcm.changed_or_added_files}")
@@ -121,12 +139,6 @@ class BuildTask(WorkflowTask):
             )
         log_debug(f"Available artifacts: {context.artifacts}")
 
-        if opts["clean"]:
-            ret_code, _out = self._exec(
-                ["python", "setup.py", "clean", "--all"] + extra_args
-            )
-            ok = ok and (ret_code == 0)
-
         return ok
 
     @classmethod
@@ -6,7 +6,7 @@
 from typing import TYPE_CHECKING
 
 from ..util import ConfigError, check_arg, log_error, log_info, log_warning
-from ..version_manager import INCREMENTS, ORDERED_INCREMENTS
+from ..version_manager import INCREMENT_ORDER, INCREMENTS, ORDERED_INCREMENTS
 from .common import SkipTaskResult, TaskContext, WorkflowTask
 
 if TYPE_CHECKING:  # Imported by type checkers, but prevent circular includes
@@ -21,6 +21,11 @@ class BumpTask(WorkflowTask):
         "prerelease_start_idx": 1,
     }
     MANDATORY_OPTS = None
+    OPT_TYPES = {
+        "check": bool,
+        "prerelease_prefix": str,
+        "prerelease_start_idx": int,
+    }
 
     def __init__(self, task_inst: "TaskInstance"):
         super().__init__(task_inst)
@@ -29,9 +34,6 @@ class BumpTask(WorkflowTask):
         check_arg(
             opts["inc"], str, or_none=True, condition=opts.get("inc") in INCREMENTS
         )
-        check_arg(opts["check"], bool)
-        check_arg(opts["prerelease_prefix"], str)
-        check_arg(opts["prerelease_start_idx"], int)
         self.version_before_bump = None
 
     def to_str(self, context: TaskContext):
@@ -84,8 +86,13 @@ class BumpTask(WorkflowTask):
             return "'bump' tasks require `--inc` argument or `inc` option"
 
         max_increment = config.get("max_increment", "minor")
-        max_idx = ORDERED_INCREMENTS.index(max_increment)
-        inc_idx = ORDERED_INCREMENTS.index(inc)
+        max_idx = INCREMENT_ORDER.get(max_increment)
+        inc_idx = INCREMENT_ORDER.get(inc)
+        expected = ", ".join(ORDERED_INCREMENTS)
+        if max_idx is None:
+            return f"Invalid `max_increment` option '{max_increment}' (expected {expected})."
+        if inc_idx is None:
+            return f"Invalid `inc` value '{inc}' (expected {expected})."
         if inc_idx > max_idx:
             if cli_arg("force"):
                 log_warning(
@@ -127,12 +134,10 @@ class BumpTask(WorkflowTask):
             )
 
         vm = context.version_manager
-        repo = context.repo_obj
 
         org_version = context.org_version
         is_prerelease = bool(org_version and org_version.prerelease)
-        tag_names = [tag.name.lstrip("vV") for tag in repo.tags]
-        is_version_tagged = str(org_version).lstrip("vV") in tag_names
+        is_version_tagged = str(org_version) in context.get_version_tag_names()
 
         if (
             self.cli_arg("inc") == "postrelease"
@@ -165,11 +170,11 @@ class BumpTask(WorkflowTask):
 
         if opts["check"] and not dry_run:
             # _ret_code, real_version = self._exec(["python", "setup.py", "--version"])
-            setup_info = self.get_setup_metadata()
+            setup_info = self.get_setup_metadata(context=context)
             real_version = setup_info["version"]
             if real_version != str(vm.master_version):
                 log_error(
-                    f"`setup.py --version` returned {real_version!r} (expected {vm.master_version!r})."
+                    f"`{setup_info['source']}` returned {real_version!r} (expected {vm.master_version!r})."
                 )
                 return False
 
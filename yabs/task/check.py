@@ -4,47 +4,88 @@
 """
 """
 import json
+import os
 import platform
 import re
 import shutil
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Dict, Iterable
 
 import requests
-from github import Github
 from semantic_version import SimpleSpec, Version
 
-from ..util import check_arg, log_debug, log_error, log_info, log_warning
+from .. import __version__
+from ..util import (
+    get_user_cache_dir,
+    log_debug,
+    log_error,
+    log_info,
+    log_warning,
+)
 from ..util import plural_s as ps
 from ..util import to_list, write
 from .common import (
-    DEFAULT_USER_AGENT,
-    REQUESTS_HEADERS,
+    REQUESTS_TIMEOUT,
+    NoneType,
     TaskContext,
     WarningTaskResult,
     WorkflowTask,
+    get_requests_session,
 )
 
 if TYPE_CHECKING:  # Imported by type checkers, but prevent circular includes
     from yabs.task_runner import TaskInstance
 
 
-def _get_package_version(package_name, *, or_none=False):
+#: Name of the current OS, e.g. 'Windows' (constant for the process)
+PLATFORM_SYSTEM = platform.system()
+#: True if running inside a virtual environment (constant for the process)
+IS_VENV = hasattr(sys, "real_prefix") or sys.base_prefix != sys.prefix
+#: Version of the running Python interpreter, e.g. `Version('3.11.7')`
+PYTHON_VERSION = Version("{}.{}.{}".format(*sys.version_info[:3]))
+#: Cache file (in `get_user_cache_dir()`) for ETags of GitHub API responses
+GH_ETAG_CACHE_NAME = "gh_etag.json"
+#: Cache file (in `get_user_cache_dir()`) for PyPI package infos and ETags
+PYPI_CACHE_NAME = "pypi_info.json"
+
+
+def _load_json_cache(name: str) -> dict:
+    """Return the content of a JSON cache file (empty dict if not available)."""
+    path = get_user_cache_dir() / name
+    try:
+        with path.open("rt") as fp:
+            cache = json.load(fp)
+        return cache if isinstance(cache, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_json_cache(name: str, cache: dict) -> None:
+    path = get_user_cache_dir() / name
+    # Write atomically, so concurrent readers never see a partial file
+    tmp_path = path.with_suffix(".tmp")
     try:
-        import importlib.metadata
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tmp_path.open("wt") as fp:
+            json.dump(cache, fp)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        log_debug(f"Could not write {path}: {e}")
 
-        version = importlib.metadata.version(package_name)
-    except ImportError:
-        import pkg_resources
 
-        version = pkg_resources.get_distribution(package_name).version
+#: Split a PEP 440 version into semver parts
+_PEP440_RE = re.compile(
+    r"^(?P<major>[0-9]+)\.(?P<minor>[0-9]+)\.(?P<patch>[0-9]+)(?P<suffix>.*)?"
+)
+
 
+def _to_semver(version: str) -> Version:
+    """Convert a PEP 440 version string to `semantic_version.Version`."""
     # PEP 440 uses `1.2.3a1`, but semver demands `1.2.3-a1`
-    match = re.match(
-        r"^(?P<major>[0-9]+)\.(?P<minor>[0-9]+)\.(?P<patch>[0-9]+)(?P<suffix>.*)?",
-        version,
-    )
+    match = _PEP440_RE.match(version)
     version = "{}.{}.{}".format(
         match.group("major"), match.group("minor"), match.group("patch")
     )
@@ -54,40 +95,76 @@ def _get_package_version(package_name, *, or_none=False):
     return Version(version.strip())
 
 
+def _which_all(names: Iterable[str]) -> Dict[str, str]:
+    """Like `shutil.which()` for multiple commands, but scan `PATH` only once.
+
+    Return a dict that maps the names of the commands that were found to
+    their full path.
+    """
+    names = list(names)
+    found = {}
+    for folder in os.environ.get("PATH", os.defpath).split(os.pathsep):
+        for name in names:
+            if name not in found:
+                # Let `shutil.which()` apply the platform rules (PATHEXT,
+                # current directory on Windows, ...) to this folder
+                path = shutil.which(name, path=folder)
+                if path:
+                    found[name] = path
+        if len(found) == len(names):
+            break
+    return found
+
+
 class CheckTask(WorkflowTask):
     DEFAULT_OPTS = {
         "build": True,
         "can_push": True,
         "clean": True,
-        "github": True,
+        "github": True,  # True/"full", or "minimal" (only check the token)
         "os": None,
         "pypi": True,
         "python": None,
         "up_to_date": True,
+        "up_to_date_ttl": 60,  # Skip `git remote update` if fetched recently
         "venv": True,
         "version": True,
         "winget": None,  # default True if winget_relase task exists
         "yabs": None,
     }
     MANDATORY_OPTS = None
+    OPT_TYPES = {
+        "build": (bool, NoneType),
+        "can_push": (bool, NoneType),
+        "clean": (bool, NoneType),
+        "github": (bool, str, NoneType),
+        "os": (str, list, tuple, NoneType),
+        "pypi": (bool, NoneType),
+        "python": (str, SimpleSpec, NoneType),
+        "up_to_date": (bool, NoneType),
+        "up_to_date_ttl": (int, float),
+        "venv": (bool, NoneType),
+        "winget": (bool, NoneType),
+        "yabs": (str, SimpleSpec, NoneType),
+    }
+    #: Options that configure other checks, but are not a check themselves
+    NON_CHECK_OPTS = frozenset(("up_to_date_ttl",))
+    #: Checks that mostly wait for network or subprocess I/O.
+    #: Every group is run in a separate thread. Checks that access the git
+    #: repo are in one group, because GitPython's `Repo` is not thread safe.
+    PARALLEL_CHECK_GROUPS = (
+        # `can_push` may make the fetch of `up_to_date` obsolete, and `clean`
+        # can re-use the `git status` output of `up_to_date`
+        ("can_push", "up_to_date", "clean"),
+        ("github",),
+        ("pypi",),
+        ("version",),
+    )
 
     def __init__(self, task_inst: "TaskInstance"):
         super().__init__(task_inst)
 
         opts = self.opts
-
-        check_arg(opts["build"], bool, or_none=True)
-        check_arg(opts["can_push"], bool, or_none=True)
-        check_arg(opts["clean"], bool, or_none=True)
-        # check_arg(opts["gh_auth"], dict, or_none=True)
-        check_arg(opts["os"], (str, list, tuple), or_none=True)
-        check_arg(opts["pypi"], bool, or_none=True)
-        check_arg(opts["python"], (str, SimpleSpec), or_none=True)
-        check_arg(opts["up_to_date"], bool, or_none=True)
-        check_arg(opts["venv"], bool, or_none=True)
-        check_arg(opts["winget"], bool, or_none=True)
-        check_arg(opts["yabs"], (str, SimpleSpec), or_none=True)
-
         opts["os"] = to_list(opts["os"])
         if isinstance(opts["python"], str):
             opts["python"] = SimpleSpec(opts["python"])
@@ -107,9 +184,18 @@ class CheckTask(WorkflowTask):
                     "Assuming `check.winget: false`, because no `winget_release` task is active."
                 )
 
-        self.enabled_checks = [k for k, v in sorted(self.opts.items()) if v]
+        #: (list) Names of active checks (in `DEFAULT_OPTS` order)
+        self.enabled_checks = [
+            name
+            for name in self.DEFAULT_OPTS
+            if name not in self.NON_CHECK_OPTS and opts[name]
+        ]
         self.run_checks = set()
         self.failed_checks = set()
+        #: (str) Cached output of `git status --porcelain=v2 --branch -uno`
+        self._git_status = None
+        #: (bool) True if `git push --dry-run` reported 'Everything up-to-date'
+        self._push_up_to_date = False
 
     def to_str(self, context: TaskContext):
         # passed_tests = self.run_tests.difference(self.failed_tests)
@@ -120,9 +206,13 @@ class CheckTask(WorkflowTask):
 
         return (
             f"{self.__class__.__name__}("
-            f"{len(self.run_checks)}/{len(self.DEFAULT_OPTS)} checks{failed})"
+            f"{len(self.run_checks)}/{self.check_count()} checks{failed})"
         )
 
+    @classmethod
+    def check_count(cls) -> int:
+        return len(cls.DEFAULT_OPTS) - len(cls.NON_CHECK_OPTS)
+
     @classmethod
     def register_cli_command(cls, subparsers, parents, run_parser):
         # Additional arguments for the 'run' command
@@ -136,280 +226,392 @@ class CheckTask(WorkflowTask):
     def check_task_def(cls, task_inst: "TaskInstance"):
         return True
 
-    def run(self, context: TaskContext):
-        opts = self.opts
-        cli_arg = self.cli_arg
+    def _get_git_status(self, context: TaskContext, refresh: bool = False) -> str:
+        """Return the (cached) machine readable `git status` output."""
+        if refresh or self._git_status is None:
+            self._git_status = context.repo_obj.git.status(
+                "--porcelain=v2", "--branch", "-uno"
+            )
+        return self._git_status
+
+    def _check_build(self, context: TaskContext, res: "_CheckResults"):
+        dist_dir = Path("dist").absolute()
+        if dist_dir.is_dir():
+            res.ok("build", f"Dist folder exists: {dist_dir}")
+        else:
+            res.error(
+                "build",
+                f"Dist folder missing: {dist_dir}: Please create and add to .gitignore",
+            )
 
+    def _check_can_push(self, context: TaskContext, res: "_CheckResults"):
         FLAG_ERROR = 1024
         FLAG_UP_TO_DATE = 512
 
-        def _ok(name, msg, output=None):
-            assert name in self.DEFAULT_OPTS
-            self.run_checks.add(name)
-            write(msg, level="info", prefix="check", output=output)
-
-        def _warn(name, msg, output=None):
-            assert name in self.DEFAULT_OPTS
-            self.run_checks.add(name)
-            write(msg, level="warning", prefix="check", output=output)
-
-        def _error(name, msg, output=None):
-            assert name in self.DEFAULT_OPTS
-            self.run_checks.add(name)
-            self.failed_checks.add(name)
-            write(msg, level="error", prefix="check", output=output)
-            err_list.append(msg)
+        try:
+            info = context.repo_obj.remote().push(dry_run=True)[0]
+            if info.flags & FLAG_ERROR:
+                msg = f"`git push` would fail (flags: {info.flags})"
+                res.error("can_push", msg, info.summary)
+            elif not (info.flags & FLAG_UP_TO_DATE):
+                msg = f"`git push` would transfer data (flags: {info.flags})"
+                res.warn("can_push", msg, info.summary)
+            else:
+                self._push_up_to_date = True
+                res.ok("can_push", "`git push` would succeed.")
+        except Exception as e:
+            res.error("can_push", f"`git push` would fail: ({e})")
 
+    def _check_clean(self, context: TaskContext, res: "_CheckResults"):
         repo = context.repo_obj
-        repo_remote = repo.remote()
-        repo_name = opts.get("repo") or context.repo
-
-        err_list = []
-
-        if opts["build"]:
-            dist_dir = Path("dist").absolute()
-            if dist_dir.is_dir():
-                _ok("build", f"Dist folder exists: {dist_dir}")
-            else:
-                _error(
-                    "build",
-                    f"Dist folder missing: {dist_dir}: Please create and add to .gitignore",
-                )
+        # Same as `repo.is_dirty()` (which calls `git diff` twice): every
+        # line that is not a `# branch.*` header is a changed entry
+        status = self._get_git_status(context)
+        if any(not line.startswith("#") for line in status.splitlines()):
+            msg = "Repository has pending commits"
+            res.error("clean", msg, repo.git.status())
+        else:
+            res.ok("clean", "Repository is clean.")
+
+    def _check_github(self, context: TaskContext, res: "_CheckResults"):
+        repo_name = self.opts.get("repo") or context.repo
+        if not repo_name or "/" not in repo_name:
+            res.error(
+                "github",
+                f"Invalid repo name (expected `GH-USER/PROJECT`): {repo_name}",
+            )
+            return
+        # GitHub Actions provide `GITHUB_TOKEN`
+        token = context.gh_auth_token or os.environ.get("GITHUB_TOKEN")
+        if not token:
+            # Unauthenticated requests are limited to 60 per hour
+            res.warn(
+                "github",
+                "Missing GitHub OAuth token (see `config.gh_auth`): "
+                "skipping GitHub access check.",
+            )
+            return
+        headers = {"Authorization": f"token {token}"}
 
-        # if opts["branches"]:
-        #     cur_branch = repo.active_branch.name
-        #     if cur_branch in opts["branches"]:
-        #         _ok(
-        #             "branches",
-        #             "Active branch {!r} is in allowed list ({}).".format(
-        #                 cur_branch, ", ".join(opts["branches"])
-        #             ),
-        #         )
-        #     else:
-        #         _error(
-        #             "branches",
-        #             "Active branch {!r} not in allowed list ({}).".format(
-        #                 cur_branch, ", ".join(opts["branches"])
-        #             ),
-        #         )
-
-        if opts["can_push"]:
+        if self.opts["github"] == "minimal":
+            # Only validate the token: `/rate_limit` does not count against
+            # the quota
             try:
-                info = repo_remote.push(dry_run=True)[0]
-                if info.flags & FLAG_ERROR:
-                    msg = f"`git push` would fail (flags: {info.flags})"
-                    _error("can_push", msg, info.summary)
-                elif not (info.flags & FLAG_UP_TO_DATE):
-                    msg = f"`git push` would transfer data (flags: {info.flags})"
-                    _warn("can_push", msg, info.summary)
-                else:
-                    _ok("can_push", "`git push` would succeed.")
+                resp = get_requests_session().head(
+                    "https://api.github.com/rate_limit",
+                    headers=headers,
+                    timeout=REQUESTS_TIMEOUT,
+                )
+                resp.raise_for_status()
+                res.ok("github", "GitHub token is valid.")
             except Exception as e:
-                _error("can_push", f"`git push` would fail: ({e})")
+                res.error("github", f"Could not validate GitHub token: {e!r}")
+            return
+
+        # A HEAD request is enough to check access (no need to fetch and
+        # parse the full repo JSON like `gh.get_repo(lazy=False)` would)
+        gh_api_url = f"https://api.github.com/repos/{repo_name}"
+        # Conditional requests that return `304 Not Modified` don't count
+        # against the GitHub API rate limit
+        etag_cache = _load_json_cache(GH_ETAG_CACHE_NAME)
+        etag = etag_cache.get(gh_api_url)
+        if etag:
+            headers["If-None-Match"] = etag
+        try:
+            resp = get_requests_session().head(
+                gh_api_url, headers=headers, timeout=REQUESTS_TIMEOUT
+            )
+            resp.raise_for_status()
+            if resp.status_code != 304 and resp.headers.get("ETag"):
+                etag_cache[gh_api_url] = resp.headers["ETag"]
+                _save_json_cache(GH_ETAG_CACHE_NAME, etag_cache)
+            res.ok("github", f"GitHub repo {repo_name} is accessible.")
+        except Exception as e:
+            res.error("github", f"Could not access GitHub repo {repo_name}: {e!r}")
+
+    def _check_os(self, context: TaskContext, res: "_CheckResults"):
+        allowed = self.opts["os"]
+        system = PLATFORM_SYSTEM
+        if system in allowed:
+            res.ok(
+                "os",
+                "Platform {!r} is in allowed list ({}).".format(
+                    system, ", ".join(allowed)
+                ),
+            )
+        else:
+            res.error(
+                "os",
+                "Platform {!r} not in allowed list ({}).".format(
+                    system, ", ".join(allowed)
+                ),
+            )
 
-        if opts["clean"]:
-            if repo.is_dirty():
-                msg = "Repository has pending commits"
-                _error("clean", msg, repo.git.status())
-            else:
-                _ok("clean", "Repository is clean.")
+    def _check_python(self, context: TaskContext, res: "_CheckResults"):
+        req_ver = self.opts["python"]
+        cur_ver = PYTHON_VERSION
+        if req_ver.match(cur_ver):
+            res.ok("python", f"Python version {cur_ver} matches '{req_ver}'.")
+        else:
+            res.error("python", f"Python version {cur_ver} does not match '{req_ver}'.")
+
+    def _check_pypi(self, context: TaskContext, res: "_CheckResults"):
+        err = self._check_twine_availability()
+        if err:
+            # The check failed anyway, so don't bother querying PyPI
+            res.error("pypi", err)
+            return
+        res.ok("pypi", "`twine` is available and configured.")
+
+        package_name = context.repo_short  # TODO: allow to override
+        pypy_api_url = f"https://pypi.org/pypi/{package_name}/json"
+        # Revalidate the cached info with a conditional request: PyPI returns a
+        # small `304 Not Modified` instead of the (possibly large) JSON
+        pypi_cache = _load_json_cache(PYPI_CACHE_NAME)
+        cached = pypi_cache.get(pypy_api_url)
+        headers = {}
+        if cached and cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        try:
+            resp = None
+            resp = get_requests_session().get(
+                pypy_api_url, headers=headers, timeout=REQUESTS_TIMEOUT
+            )
+            resp.raise_for_status()
 
-        if opts["github"]:
-            if not repo_name or "/" not in repo_name:
-                _error(
-                    "github",
-                    f"Invalid repo name (expected `GH-USER/PROJECT`): {repo_name}",
+            if resp.status_code == 304:
+                pypi_info = cached["info"]
+            else:
+                pypi_info = resp.json()["info"]
+                pypi_cache[pypy_api_url] = {
+                    "etag": resp.headers.get("ETag"),
+                    "info": {k: pypi_info[k] for k in ("name", "version")},
+                }
+                _save_json_cache(PYPI_CACHE_NAME, pypi_cache)
+            res.ok(
+                "pypi",
+                f"Package `{package_name}` is registered on PyPI "
+                f"(name: '{pypi_info['name']}', version: '{pypi_info['version']}').",
+            )
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if not cached:
+                res.error(
+                    "pypi",
+                    f"Failed to query package `{package_name}` on PyPI: {e!r}",
                 )
-            token = context.gh_auth_token
-            try:
-                gh = Github(token, user_agent=DEFAULT_USER_AGENT)
-                gh_repo = gh.get_repo(repo_name, lazy=False)
-                full_name = gh_repo.full_name
-                _ok(
-                    "github",
-                    f"GitHub repo {repo_name} is accessible: {full_name}",
+                return
+            # Offline: the package was registered when we checked last time
+            pypi_info = cached["info"]
+            res.ok(
+                "pypi",
+                f"Package `{package_name}` is registered on PyPI "
+                f"(name: '{pypi_info['name']}', version: '{pypi_info['version']}', "
+                "cached: PyPI is not reachable).",
+            )
+        except Exception as e:
+            if isinstance(e, requests.HTTPError) and resp.status_code == 404:
+                # https://packaging.python.org/en/latest/guides/migrating-to-pypi-org/#registering-package-names-metadata
+                res.error(
+                    "pypi",
+                    f"Package `{package_name}` not yet registered on PyPI: "
+                    "Continuing would register the new package.",
                 )
-            except Exception as e:
-                _error("github", f"Could not access GitHub repo {repo_name}: {e!r}")
-
-        if opts["os"]:
-            system = platform.system()
-            if system in opts["os"]:
-                _ok(
-                    "os",
-                    "Platform {!r} is in allowed list ({}).".format(
-                        system, ", ".join(opts["os"])
-                    ),
+                res.note(
+                    "This is not an error, just a warning to prevent accidental registration:"
+                )
+                res.note(
+                    "Ignore checks using `--no-checks` or run `twine upload` manually."
                 )
             else:
-                _error(
-                    "os",
-                    "Platform {!r} not in allowed list ({}).".format(
-                        system, ", ".join(opts["os"])
-                    ),
+                res.error(
+                    "pypi",
+                    f"Failed to query package `{package_name}` on PyPI: {e!r}",
                 )
 
-        if opts["python"]:
-            req_ver = opts["python"]
-            cur_ver = Version(".".join(map(str, sys.version_info[:3])))
-            if req_ver.match(cur_ver):
-                _ok("python", f"Python version {cur_ver} matches '{req_ver}'.")
+    def _check_up_to_date(self, context: TaskContext, res: "_CheckResults"):
+        if self._push_up_to_date:
+            # `git push --dry-run` just compared with the remote branch
+            res.ok(
+                "up_to_date", "Remote branch is identical (`git push` is up-to-date)."
+            )
+            return
+
+        repo = context.repo_obj
+        try:
+            # `TaskContext.initialize()` may just have fetched, so we don't
+            # need to contact the remote again (FETCH_HEAD's mtime is no
+            # indicator, because a failed fetch touches it as well)
+            ttl = self.opts["up_to_date_ttl"]
+            if ttl and context.fetch_time is not None:
+                fetch_age = time.time() - context.fetch_time
             else:
-                _error(
-                    "python", f"Python version {cur_ver} does not match '{req_ver}'."
+                fetch_age = None
+            updated = False
+            if fetch_age is not None and fetch_age < ttl:
+                log_debug(
+                    f"Skipping `git remote update` (fetched {fetch_age:.0f}s ago)."
                 )
+            else:
+                repo.remote().update()
+                updated = True
+            # The `# branch.ab +AHEAD -BEHIND` header is machine readable and
+            # does not depend on the locale (unlike `use "git pull"` hints)
+            status = self._get_git_status(context, refresh=updated)
+            behind = 0
+            for line in status.splitlines():
+                if line.startswith("# branch.ab "):
+                    _ahead, behind = line[len("# branch.ab ") :].split()
+                    behind = -int(behind)
+                    break
+            if behind > 0:
+                msg = f"Remote branch contains {behind} unpulled commit{ps(behind)}"
+                res.error("up_to_date", msg, status)
+            else:
+                res.ok("up_to_date", "Remote branch has not diverged.")
+        except Exception as e:
+            res.error("up_to_date", f"Repo update & status failed: {e}")
+
+    def _check_venv(self, context: TaskContext, res: "_CheckResults"):
+        if IS_VENV:
+            res.ok("venv", "Running inside a virtual environment.")
+        else:
+            res.error("venv", "Not running inside a virtual environment.")
+
+    def _check_version(self, context: TaskContext, res: "_CheckResults"):
+        # Static pyproject.toml/setup.cfg values avoid a `setup.py` subprocess
+        setup_info = self.get_setup_metadata([], context=context)
+        real_version, source = setup_info["version"], setup_info["source"]
+        vm = context.version_manager
+        if real_version != str(vm.master_version):
+            res.error(
+                "version",
+                f"`{source}` returned {real_version!r} (expected {vm.master_version!r}).",
+            )
+        else:
+            res.ok("version", f"`{source}` returned {real_version!r}.")
 
-        if opts["pypi"]:
-            err = self._check_twine_availability()
-            if err:
-                _error("pypi", err)
-            _ok("pypi", "`twine` is available and configured.")
+    def _check_winget(self, context: TaskContext, res: "_CheckResults"):
+        cli_arg = self.cli_arg
 
-            package_name = context.repo_short  # TODO: allow to override
-            pypy_api_url = f"https://pypi.org/pypi/{package_name}/json"
-            try:
-                resp = None
-                resp = requests.get(
-                    pypy_api_url, verify=False, headers=REQUESTS_HEADERS
-                )
-                resp.raise_for_status()
+        winget_ok = True
+        if PLATFORM_SYSTEM == "Windows":
+            res.ok("winget", "Running on MS Windows.")
+        else:
+            winget_ok = False
+            res.error(
+                "winget",
+                f"Runinng on {PLATFORM_SYSTEM} (winget needs MS Windows).",
+            )
 
-                pypi_info = json.loads(resp.text)
-                pypi_info = pypi_info["info"]
-                _ok(
-                    "pypi",
-                    f"Package `{package_name}` is registered on PyPI "
-                    f"(name: '{pypi_info['name']}', version: '{pypi_info['version']}').",
-                )
-            except Exception as e:
-                if isinstance(e, requests.HTTPError) and resp.status_code == 404:
-                    # https://packaging.python.org/en/latest/guides/migrating-to-pypi-org/#registering-package-names-metadata
-                    _error(
-                        "pypi",
-                        f"Package `{package_name}` not yet registered on PyPI: "
-                        "Continuing would register the new package.",
-                    )
-                    log_warning(
-                        "This is not an error, just a warning to prevent accidental registration:"
-                    )
-                    log_warning(
-                        "Ignore checks using `--no-checks` or run `twine upload` manually."
-                    )
-                else:
-                    _error(
-                        "pypi",
-                        f"Failed to query package `{package_name}` on PyPI: {e!r}",
-                    )
-
-        if opts["up_to_date"]:
-            try:
-                status = None
-                repo_remote.update()
-                status = repo.git.status("-uno", porcelain=False)
-                if 'use "git pull"' in status:
-                    msg = "Remote branch contains unpulled changes"
-                    _error("up_to_date", msg, status)
-                else:
-                    _ok("up_to_date", "Remote branch has not diverged.")
-            except Exception as e:
-                _error("up_to_date", f"Repo update & status failed: {e}")
+        if cli_arg("inc") == "postrelease" and not cli_arg("no_winget_release"):
+            res.error(
+                "winget",
+                "`--inc postrelease` not allowed (cannot publish pre-releases on winget-pkgs).",
+            )
 
-        if opts["venv"]:
-            is_venv = hasattr(sys, "real_prefix") or sys.base_prefix != sys.prefix
-            if is_venv:
-                _ok("venv", "Running inside a virtual environment.")
-            else:
-                _error("venv", "Not running inside a virtual environment.")
-
-        if opts["version"]:
-            # _ret_code, real_version = self._exec(
-            #     ["python", "setup.py", "--version"], quiet=True
-            # )
-            setup_info = self.get_setup_metadata([])
-            real_version = setup_info["version"]
-            vm = context.version_manager
-            if real_version != str(vm.master_version):
-                _error(
-                    "version",
-                    f"`setup.py --version` returned {real_version!r} (expected {vm.master_version!r}).",
-                )
-            else:
-                _ok("version", f"`setup.py --version` returned {real_version!r}.")
+        if len(_which_all(("winget", "wingetcreate"))) == 2:
+            res.ok("winget", "`winget` and `wingetcreate` are available.")
+        else:
+            winget_ok = False
+            res.error("winget", "`winget` and/or `wingetcreate` not available.")
 
-        if opts["winget"]:
-            winget_ok = True
-            if platform.system() == "Windows":
-                _ok("winget", "Running on MS Windows.")
-            else:
-                winget_ok = False
-                _error(
+        if not winget_ok:
+            return
+
+        # Is project is registered at winget-pkgs?
+        package_name = context.repo_short  # TODO: allow to override
+        ret_code, real_version = self._exec(
+            ["winget", "show", package_name], quiet=True
+        )
+        if ret_code:
+            if cli_arg("no_winget_release"):
+                res.warn(
                     "winget",
-                    f"Runinng on {platform.system()} (winget needs MS Windows).",
+                    f"Package `{package_name}` not found on winget-pkgs "
+                    "(ignored, because --no-winget-release was passed).",
                 )
-
-            if cli_arg("inc") == "postrelease" and not cli_arg("no_winget_release"):
-                _error(
+            elif ret_code == 0x8A150014:
+                res.error(
                     "winget",
-                    "`--inc postrelease` not allowed (cannot publish pre-releases on winget-pkgs).",
+                    f"Package `{package_name}` not yet registered on winget-pkgs: "
+                    "Yabs supports updating existing packages only.",
                 )
-
-            if shutil.which("winget") and shutil.which("wingetcreate"):
-                _ok("winget", "`winget` and `wingetcreate` are available.")
-            else:
-                winget_ok = False
-                _error("winget", "`winget` and/or `wingetcreate` not available.")
-
-            if winget_ok:
-                # Is project is registered at winget-pkgs?
-                package_name = context.repo_short  # TODO: allow to override
-                ret_code, real_version = self._exec(
-                    ["winget", "show", package_name], quiet=True
+                res.note(
+                    f"winget returned code 0x{ret_code:08x}, "
+                    "see https://github.com/microsoft/winget-cli/blob/master/src/AppInstallerCommonCore/Public/AppInstallerErrors.h"
+                )
+                res.note(
+                    "Note that Yabs only supports updating existing winget packages."
+                )
+                res.note(
+                    "Run `wingetcreate new` manually, "
+                    "see https://yabs.readthedocs.io/en/latest/ug_tutorial.html#windows-package-manager"
                 )
-                if ret_code:
-                    if cli_arg("no_winget_release"):
-                        _warn(
-                            "winget",
-                            f"Package `{package_name}` not found on winget-pkgs "
-                            "(ignored, because --no-winget-release was passed).",
-                        )
-                    elif ret_code == 0x8A150014:
-                        _error(
-                            "winget",
-                            f"Package `{package_name}` not yet registered on winget-pkgs: "
-                            "Yabs supports updating existing packages only.",
-                        )
-                        log_warning(
-                            f"winget returned code 0x{ret_code:08x}, "
-                            "see https://github.com/microsoft/winget-cli/blob/master/src/AppInstallerCommonCore/Public/AppInstallerErrors.h"
-                        )
-                        log_warning(
-                            "Note that Yabs only supports updating existing winget packages."
-                        )
-                        log_warning(
-                            "Run `wingetcreate new` manually, "
-                            "see https://yabs.readthedocs.io/en/latest/ug_tutorial.html#windows-package-manager"
-                        )
-                    else:
-                        _error(
-                            "winget",
-                            f"Could not find package `{package_name}` on winget-pkgs "
-                            f"(return code: 0x{ret_code:08x}): "
-                            "Yabs supports updating existing packages only.",
-                            "see https://yabs.readthedocs.io/en/latest/ug_tutorial.html#windows-package-manager",
-                        )
-                else:
-                    _ok(
-                        "winget",
-                        f"Package `{package_name}` is registered on winget-pkgs.",
-                    )
-
-        if opts["yabs"]:
-            req_ver = opts["yabs"]
-            cur_ver = _get_package_version("yabs")
-            if req_ver.match(cur_ver):
-                _ok("yabs", f"Yabs version {cur_ver} matches '{req_ver}'.")
             else:
-                _error("yabs", f"Yabs version {cur_ver} does not match '{req_ver}'.")
+                res.error(
+                    "winget",
+                    f"Could not find package `{package_name}` on winget-pkgs "
+                    f"(return code: 0x{ret_code:08x}): "
+                    "Yabs supports updating existing packages only.",
+                    "see https://yabs.readthedocs.io/en/latest/ug_tutorial.html#windows-package-manager",
+                )
+        else:
+            res.ok(
+                "winget",
+                f"Package `{package_name}` is registered on winget-pkgs.",
+            )
+
+    def _check_yabs(self, context: TaskContext, res: "_CheckResults"):
+        req_ver = self.opts["yabs"]
+        # Our own version is known, no need to query the package metadata
+        cur_ver = _to_semver(__version__)
+        if req_ver.match(cur_ver):
+            res.ok("yabs", f"Yabs version {cur_ver} matches '{req_ver}'.")
+        else:
+            res.error("yabs", f"Yabs version {cur_ver} does not match '{req_ver}'.")
+
+    def run(self, context: TaskContext):
+        cli_arg = self.cli_arg
+
+        enabled = self.enabled_checks
+        results = {}
+
+        def _run_checks(names):
+            for name in names:
+                res = _CheckResults()
+                getattr(self, f"_check_{name}")(context, res)
+                results[name] = res
+
+        # Run the I/O bound check groups in parallel. Results are collected
+        # and logged afterwards in a stable order.
+        parallel = [
+            [name for name in group if name in enabled]
+            for group in self.PARALLEL_CHECK_GROUPS
+        ]
+        parallel = [group for group in parallel if group]
+
+        if self.verbose >= 4 or len(parallel) < 2:
+            # Debug output of `_exec()` etc. would be interleaved otherwise
+            _run_checks(enabled)
+        else:
+            grouped = set().union(*parallel)
+            with ThreadPoolExecutor(max_workers=len(parallel)) as executor:
+                futures = [executor.submit(_run_checks, group) for group in parallel]
+                _run_checks([name for name in enabled if name not in grouped])
+                for future in futures:
+                    future.result()  # Re-raise exceptions
+
+        err_list = []
+        for name in enabled:
+            for level, msg, output in results[name].entries:
+                if level is None:
+                    log_warning(msg)
+                    continue
+                self.run_checks.add(name)
+                if level == "error":
+                    self.failed_checks.add(name)
+                    err_list.append(msg)
+                write(msg, level=level, prefix="check", output=output)
 
         log_info("")
 
@@ -429,3 +631,27 @@ class CheckTask(WorkflowTask):
                 log_info("Use the `--no-check` argument to ignore the errors above.")
                 return False
         return True
+
+
+class _CheckResults:
+    """Collect the results of a single check, so they can be logged later."""
+
+    def __init__(self) -> None:
+        #: List of `(level, msg, output)` tuples (level is None for notes)
+        self.entries = []
+
+    def ok(self, name: str, msg: str, output: str = None) -> None:
+        assert name in CheckTask.DEFAULT_OPTS
+        self.entries.append(("info", msg, output))
+
+    def warn(self, name: str, msg: str, output: str = None) -> None:
+        assert name in CheckTask.DEFAULT_OPTS
+        self.entries.append(("warning", msg, output))
+
+    def error(self, name: str, msg: str, output: str = None) -> None:
+        assert name in CheckTask.DEFAULT_OPTS
+        self.entries.append(("error", msg, output))
+
+    def note(self, msg: str) -> None:
+        """Additional hint that is logged as warning (does not count as check)."""
+        self.entries.append((None, msg, None))
@@ -3,12 +3,10 @@
 # Licensed under the MIT license: https://www.opensource.org/licenses/mit-license.php
 """
 """
-import os
+from threading import Thread
 from typing import TYPE_CHECKING
 
-from git import Repo
-
-from ..util import check_arg, log_dry, log_response
+from ..util import BoundedSink, assert_always, check_arg, log_dry, log_response
 from .common import TaskContext, WorkflowTask
 
 if TYPE_CHECKING:  # Imported by type checkers, but prevent circular includes
@@ -22,19 +20,16 @@ class CommitTask(WorkflowTask):
         "message": "Bump version to {version}",
     }
     MANDATORY_OPTS = None
-
-    def __init__(self, task_inst: "TaskInstance"):
-        super().__init__(task_inst)
-
-        opts = self.opts
-        check_arg(opts["add"], (list, tuple))
-        check_arg(opts["add_known"], bool)
-        check_arg(opts["message"], str)
+    OPT_TYPES = {
+        "add": (list, tuple),
+        "add_known": bool,
+        "message": str,
+    }
 
     def to_str(self, context: TaskContext):
         opts = self.opts
         add = opts["add"] or opts["add_known"]
-        message = opts["message"].format(**vars(context))
+        message = self.format_opt("message", context)
         return "{}(add: {}, '{}')".format(self.__class__.__name__, add, message.strip())
 
     @classmethod
@@ -47,10 +42,10 @@ class CommitTask(WorkflowTask):
 
     def run(self, context: TaskContext):
         opts = self.opts
-        message = opts["message"].format(**vars(context))
+        message = self.format_opt("message", context)
 
-        repo_path = os.path.abspath(".")
-        repo = Repo(repo_path)
+        assert_always(context.repo_obj is not None, "Missing `context.repo_obj`")
+        repo = context.repo_obj
         git = repo.git
         # remote = repo.remote()
         index = repo.index
@@ -63,7 +58,23 @@ class CommitTask(WorkflowTask):
             index.add(opts_add, write=not self.dry_run)
 
         if opts_add_known:
-            res = git.add(".", dry_run=self.dry_run, verbose=self.verbose >= 4)
+            if self.verbose >= 4:
+                # Stream the output, so only its tail is kept in memory (there
+                # may be thousands of changed files)
+                proc = git.add(".", dry_run=self.dry_run, verbose=True, as_process=True)
+                sink = BoundedSink()
+                err_sink = BoundedSink()
+                # Drain stderr too, so git cannot block on a full pipe
+                reader = Thread(target=err_sink.consume, args=(proc.stderr,))
+                reader.start()
+                try:
+                    sink.consume(proc.stdout)
+                finally:
+                    reader.join()
+                proc.wait(stderr=err_sink.tail_bytes())  # Raise GitCommandError
+                res = sink.tail_text()
+            else:
+                res = git.add(".", dry_run=self.dry_run)
             log_response("git add .", res, "debug", self.dry_run)
 
         if self.dry_run:
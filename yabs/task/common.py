@@ -3,14 +3,22 @@
 # Licensed under the MIT license: https://www.opensource.org/licenses/mit-license.php
 """
 """
+import configparser
+import functools
+import locale
 import os
+import re
 import shutil
 import subprocess
 import sys
+import threading
+import time
 from abc import ABC, abstractclassmethod, abstractmethod
 from pathlib import Path
-from typing import TYPE_CHECKING, List, Union
+from typing import TYPE_CHECKING, List, Set, Union
 
+import requests
+import toml
 from git import Repo
 from semantic_version import Version
 
@@ -18,6 +26,7 @@ from ..util import (
     assert_always,
     check_arg,
     check_dict_keys,
+    get_format_field_names,
     log_debug,
     log_warning,
     write,
@@ -32,6 +41,97 @@ DEFAULT_USER_AGENT = "Yabs/Python"
 
 REQUESTS_HEADERS = {"User-Agent": DEFAULT_USER_AGENT}
 
+#: Default timeout in seconds for HTTP requests
+REQUESTS_TIMEOUT = 10
+
+#: Use in `WorkflowTask.OPT_TYPES` for options that may be `None`
+NoneType = type(None)
+
+_requests_session = None
+_requests_session_lock = threading.Lock()
+
+
+def get_requests_session() -> requests.Session:
+    """Return a shared `requests.Session`.
+
+    The session keeps connections to api.github.com, pypi.org, etc. alive,
+    so subsequent requests of all tasks can skip the TCP/TLS handshake.
+    """
+    global _requests_session
+    with _requests_session_lock:
+        if _requests_session is None:
+            session = requests.Session()
+            session.headers.update(REQUESTS_HEADERS)
+            _requests_session = session
+    return _requests_session
+
+
+def _decode_process_output(data: bytes) -> str:
+    """Decode the output of a child process.
+
+    Try UTF-8 first and fall back to the locale encoding, because native
+    Windows tools (winget, cmd, ...) write in the ANSI code page.
+    """
+    try:
+        return data.decode("utf-8")
+    except UnicodeDecodeError:
+        return data.decode(locale.getpreferredencoding(False), errors="replace")
+
+
+#: Files that define the project metadata (see `get_setup_metadata()`)
+SETUP_METADATA_FILES = ("setup.py", "setup.cfg", "pyproject.toml")
+
+
+def _read_pyproject_metadata() -> Union[dict, None]:
+    path = Path("pyproject.toml")
+    if not path.is_file():
+        return None
+    try:
+        project = toml.load(path).get("project", {})
+    except toml.TomlDecodeError as e:
+        # Let the build backend report the problem
+        log_debug(f"Could not parse {path}: {e}")
+        return None
+    dynamic = project.get("dynamic", [])
+    if any(k not in project or k in dynamic for k in ("name", "version")):
+        return None
+    return {
+        "name": project["name"],
+        "version": project["version"],
+        "source": "pyproject.toml",
+    }
+
+
+def _read_setup_cfg_metadata() -> Union[dict, None]:
+    path = Path("setup.cfg")
+    if not path.is_file():
+        return None
+    setup_py = Path("setup.py")
+    if setup_py.is_file() and re.search(
+        r"\b(name|version)\s*=", setup_py.read_text(encoding="utf-8")
+    ):
+        return None  # setup() arguments override setup.cfg
+    parser = configparser.ConfigParser(interpolation=None)
+    parser.read(path, encoding="utf-8")
+    res = {"source": "setup.cfg"}
+    for key in ("name", "version"):
+        value = parser.get("metadata", key, fallback="").strip()
+        if not value or value.startswith(("attr:", "file:")):
+            return None
+        res[key] = value
+    return res
+
+
+def read_static_project_metadata() -> Union[dict, None]:
+    """Return `{"name": ..., "version": ..., "source": ...}` if defined statically.
+
+    This checks the `[project]` table of pyproject.toml and the `[metadata]`
+    section of setup.cfg.
+    Return None if the values are dynamic (e.g. `attr: pkg.__version__`) or
+    may be overridden by setup.py, i.e. we have to ask the build backend.
+    """
+    return _read_pyproject_metadata() or _read_setup_cfg_metadata()
+
 
 class TaskContext:
     """
@@ -77,6 +177,14 @@ class TaskContext:
         self.version: Version = None
         #: (:class:`~yabs.version_manager.VersionManager`)
         self.version_manager: VersionFileManager = None
+        #: (tuple) `(key, dict)` cached result of `WorkflowTask.get_setup_metadata()`
+        self._setup_metadata_cache: tuple = None
+        #: (float) time of the last successful `git fetch` (None if it failed)
+        self.fetch_time: float = None
+        #: (set) cached result of `get_version_tag_names()`
+        self._version_tag_names: set = None
+        #: (dict) `{token: Github}` cached clients of `get_github_client()`
+        self._github_clients: dict = {}
 
         self.initialize()
         return
@@ -108,27 +216,58 @@ class TaskContext:
 
         try:
             git_repo.remote().fetch(tags=True)
+            self.fetch_time = time.time()
         except Exception as e:
             log_warning(f"Unable to fetch tags from git remote: {e}")
 
-        try:
-            # Test if we have tags (but this is not neccessarily the latest)
-            has_tags = False
-            tag = git_repo.tags[0]
-            has_tags = True
-            # log_info("Latest repo tag: {}".format(tag))
-        except IndexError:
-            pass
-
-        if not has_tags:
+        # Latest tag with a single `git` call (the cost does not grow with
+        # the number of tags, unlike loading every tagged commit)
+        tag = git_repo.git.for_each_ref(
+            "refs/tags",
+            count=1,
+            sort="-creatordate",
+            format="%(refname:short)",
+        ).strip()
+        if not tag:
             tag = "v0.0.0"
             log_warning(f"Repository does not seem to have tags; assuming {tag}")
-        else:
-            res = git_repo.git.rev_list(tags=True, max_count=1)
-            tag = git_repo.git.describe(res, tags=True)
+        # log_info("Latest repo tag: {}".format(tag))
 
         self.org_tag_name = tag
 
+    def get_version_tag_names(self) -> Set[str]:
+        """Return the names of all repo tags, without 'v' or 'V' prefix.
+
+        The result is cached; call `reset_version_tag_names()` after adding tags.
+        """
+        if self._version_tag_names is None:
+            self._version_tag_names = {
+                t.name[1:] if t.name[:1] in ("v", "V") else t.name
+                for t in self.repo_obj.tags
+            }
+        return self._version_tag_names
+
+    def reset_version_tag_names(self) -> None:
+        self._version_tag_names = None
+
+    def get_github_client(self, token: str = None):
+        """Return a shared PyGithub client (defaults to `gh_auth_token`).
+
+        The client is cached per token, so all GitHub API calls of a workflow
+        can re-use its connection pool.
+        """
+        # PyGithub is slow to import, so don't load it on every CLI start
+        from github import Github
+
+        if token is None:
+            token = self.gh_auth_token
+        gh = self._github_clients.get(token)
+        if gh is None:
+            gh = self._github_clients[token] = Github(
+                token, user_agent=DEFAULT_USER_AGENT
+            )
+        return gh
+
     def close(self):
         if self.repo_obj:
             log_debug(f"Closing {self.repo_obj}...")
@@ -189,6 +328,12 @@ class WorkflowTask(ABC):
     #: (set) mandatory task options. 'task' is implicitly mandatory.
     #: This is validated by the task runner before starting the workflow.
     MANDATORY_OPTS: set = None
+    #: (dict) Allowed types per option, e.g. `{"clean": bool}`.
+    #: Values are a type or a tuple of types (add `NoneType` if `None` is allowed).
+    #: This is validated by the constructor.
+    OPT_TYPES: dict = None
+    #: (dict) Allowed types of `COMMON_OPTS`
+    COMMON_OPT_TYPES = {"dry_run": bool, "verbose": int}
 
     def __init__(self, task_inst: "TaskInstance"):
         assert self.DEFAULT_OPTS is not None
@@ -200,17 +345,31 @@ class WorkflowTask(ABC):
         self.opts: dict = self.DEFAULT_OPTS.copy()
         self.opts.update(task_inst.task_def)
 
-        check_arg(self.opts.get("dry_run"), bool)
-        check_arg(self.opts.get("verbose"), int)
+        self._check_opt_types(self.COMMON_OPT_TYPES)
+        if self.OPT_TYPES:
+            self._check_opt_types(self.OPT_TYPES)
 
         #: (bool) true if `--dry-run` was passed to the CLI
         self.dry_run: bool = self.opts.get("dry_run")
         #: (int, default=3) 0..5
         self.verbose: int = self.opts.get("verbose")
+        #: (dict) Cached field names per option template (see `format_opt()`)
+        self._format_fields = {}
 
     def __repr__(self):
         return self.to_str({})
 
+    def _check_opt_types(self, opt_types: dict) -> None:
+        """Raise TypeError if an option does not match its `OPT_TYPES` entry."""
+        opts = self.opts
+        for name, types in opt_types.items():
+            value = opts.get(name)
+            if not isinstance(value, types):
+                raise TypeError(
+                    f"{self.__class__.__name__}: expected `{name}` to be {types}, "
+                    f"but got {type(value)}"
+                )
+
     @property
     def name(self):
         return self.task_inst.name
@@ -226,6 +385,21 @@ class WorkflowTask(ABC):
         """
         return self.task_inst.task_runner.cli_arg(key, default)
 
+    def format_opt(self, opt_name: str, context: TaskContext) -> str:
+        """Return `self.opts[opt_name]` with context macros like `{version}` expanded.
+
+        Only the context attributes that are referenced by the template are
+        passed to `str.format()`, instead of a full `vars(context)` copy.
+        The referenced field names are cached per option.
+        """
+        fmt = self.opts[opt_name]
+        fields = self._format_fields.get(opt_name)
+        if fields is None:
+            fields = self._format_fields[opt_name] = get_format_field_names(fmt)
+        return fmt.format(
+            **{k: getattr(context, k) for k in fields if hasattr(context, k)}
+        )
+
     # def get_arg(self, key: str, default=NO_DEFAULT):
     #     """Return a value from command line args.
 
@@ -254,13 +428,7 @@ class WorkflowTask(ABC):
             stderr=subprocess.STDOUT,
         )
         ret_code = res.returncode
-        output = res.stdout
-        try:
-            output = output.decode()
-        except UnicodeDecodeError:
-            output = output.decode("mbcs")
-
-        output = output.strip()
+        output = _decode_process_output(res.stdout).strip()
         msg = "`{}` returned code {}".format(" ".join(args), ret_code)
 
         if ret_code != 0:
@@ -272,8 +440,10 @@ class WorkflowTask(ABC):
             write(msg, level="debug", prefix=True, output=output)
         return ret_code, output
 
-    def _check_twine_availability(self) -> Union[str, None]:
-
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def _check_twine_availability() -> Union[str, None]:
+        """Return an error message if `twine` is not usable (cached per process)."""
         # --- 1. twine available?
 
         if not shutil.which("twine"):
@@ -311,26 +481,59 @@ class WorkflowTask(ABC):
         # raise NotImplementedError
         return None  # no errors
 
-    def get_setup_metadata(self, extra_args: list = None) -> dict:
-        """'Query `setup.py` for project name and version."""
+    def get_setup_metadata(
+        self, extra_args: list = None, *, context: TaskContext = None
+    ) -> dict:
+        """'Query `setup.py` for project name and version.
+
+        Return a `{"name": ..., "version": ..., "source": ...}` dict.
+
+        Static values from pyproject.toml or setup.cfg are used if available,
+        to avoid the subprocess.
+        If `context` is passed, the result is cached there until the project
+        files or `context.version` change (e.g. the build task can then reuse
+        the result of the bump task's check).
+        """
+        if context is not None:
+            cache_key = [str(context.version)]
+            for fspec in SETUP_METADATA_FILES:
+                try:
+                    cache_key.append(os.stat(fspec).st_mtime_ns)
+                except OSError:
+                    cache_key.append(None)
+            cache_key = tuple(cache_key)
+            cached = context._setup_metadata_cache
+            if cached and cached[0] == cache_key:
+                log_debug(f"Using cached project metadata: {cached[1]}")
+                return cached[1].copy()
+            setup_info = self.get_setup_metadata(extra_args)
+            context._setup_metadata_cache = (cache_key, setup_info.copy())
+            return setup_info
+
+        setup_info = read_static_project_metadata()
+        if setup_info:
+            log_debug(f"Read static project metadata: {setup_info}")
+            return setup_info
+
         if extra_args is None:
             extra_args = []
 
-        _ret_code, real_name = self._exec(["python", "setup.py", "--name"] + extra_args)
-        if "\n" in real_name:
-            # Fix 'No `name` configuration, performing automatic discovery' prefix
-            log_warning(f"`setup.py --name` returned {real_name!r}")
-            real_name = real_name.split("\n")[-1]
-
-        _ret_code, real_version = self._exec(
-            ["python", "setup.py", "--version"] + extra_args
+        # Query both values with one call (each Python + setuptools startup is
+        # expensive). Display options are printed in the order they are passed.
+        _ret_code, out = self._exec(
+            ["python", "setup.py", "--name", "--version"] + extra_args
         )
-        if "\n" in real_version:
+        lines = out.strip().split("\n")
+        if len(lines) > 2:
             # Fix 'No `name` configuration, performing automatic discovery' prefix
-            log_warning(f"`setup.py --version` returned {real_version!r}")
-            real_version = real_version.split("\n")[-1]
-
-        return {"name": real_name, "version": real_version}
+            log_warning(f"`setup.py --name --version` returned {out!r}")
+        real_name, real_version = lines[-2:] if len(lines) >= 2 else ["", out]
+
+        return {
+            "name": real_name,
+            "version": real_version,
+            "source": "setup.py --version",
+        }
 
     @classmethod
     def _check_default_opts(
@@ -8,11 +8,12 @@ import subprocess
 import sys
 import time
 from pathlib import Path
+from threading import Thread
 from typing import TYPE_CHECKING
 
 from ..util import (
+    BoundedSink,
     FolderContentMonitor,
-    check_arg,
     format_elap,
     log_debug,
     log_dry,
@@ -21,7 +22,7 @@ from ..util import (
     log_warning,
     run_process_streamed,
 )
-from .common import TaskContext, WorkflowTask
+from .common import NoneType, TaskContext, WorkflowTask
 
 if TYPE_CHECKING:  # Imported by type checkers, but prevent circular includes
     from yabs.task_runner import TaskInstance
@@ -40,20 +41,22 @@ class ExecTask(WorkflowTask):
         "timeout": None,
     }
     MANDATORY_OPTS = {"args"}
+    OPT_TYPES = {
+        "args": (list, tuple),
+        "dry_run_args": (list, tuple, NoneType),
+        "silent": bool,
+        "always": bool,
+        "add_artifacts": (dict, NoneType),
+        "ignore_errors": bool,
+        "log_start": bool,
+        "stream": (bool, NoneType),
+        "timeout": (int, float, NoneType),
+    }
 
     def __init__(self, task_inst: "TaskInstance"):
         super().__init__(task_inst)
 
         opts = self.opts
-        check_arg(opts["args"], (list, tuple))
-        check_arg(opts["dry_run_args"], (list, tuple), or_none=True)
-        check_arg(opts["silent"], bool)
-        check_arg(opts["always"], bool)
-        check_arg(opts["add_artifacts"], dict, or_none=True)
-        check_arg(opts["ignore_errors"], bool)
-        check_arg(opts["log_start"], bool)
-        check_arg(opts["stream"], bool, or_none=True)
-        check_arg(opts["timeout"], (int, float), or_none=True)
         if opts["dry_run_args"] and opts["always"]:
             raise RuntimeError("`dry_run_args` and `always` are mutually exclusive")
         if opts["silent"] and opts["stream"]:
@@ -61,6 +64,11 @@ class ExecTask(WorkflowTask):
         if opts["stream"] is None and opts["verbose"] > 3:
             log_debug("Enabling streaming output in verbose mode.")
             opts["stream"] = True
+        # Fix python calls to use the executable from the virtual environment
+        for key in ("args", "dry_run_args"):
+            args = opts[key]
+            if args and args[0].lower() == "python":
+                opts[key] = [sys.executable, *args[1:]]
         return
 
     def to_str(self, context: TaskContext):
@@ -112,10 +120,6 @@ class ExecTask(WorkflowTask):
 
         args = opts["args"]
 
-        # Fix python calls to use the executable from the virtual environment
-        if args[0].lower() == "python":
-            args[0] = sys.executable
-
         if self.dry_run:
             if not opts["always"] and opts["dry_run_args"] is None:
                 log_dry("Execute {}".format(" ".join(opts["args"])))
@@ -143,9 +147,19 @@ class ExecTask(WorkflowTask):
                     ret_code, output = run_process_streamed(proc, name, timeout=timeout)
                     output = ""  # already printed
             else:
-                proc = subprocess.run(args, timeout=timeout, **popen_opts)
-                ret_code = proc.returncode
-                output = proc.stdout.decode()
+                # Only keep the tail of the output, in case the process is chatty
+                sink = BoundedSink()
+                with subprocess.Popen(args, **popen_opts) as proc:
+                    reader = Thread(target=sink.consume, args=(proc.stdout,))
+                    reader.start()
+                    try:
+                        ret_code = proc.wait(timeout=timeout)
+                    except subprocess.TimeoutExpired:
+                        proc.kill()
+                        raise
+                    finally:
+                        reader.join()
+                output = sink.tail_text()
 
         if fcm.changed_or_added_files:
             # log_info(f"Created artifacts: {fcm.changed_or_added_files}")
@@ -4,13 +4,11 @@
 """
 """
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import TYPE_CHECKING
 
-from github import Github, GithubObject
-
 from ..util import (
     ConfigError,
-    check_arg,
     log_dry,
     log_error,
     log_info,
@@ -18,7 +16,7 @@ from ..util import (
     log_warning,
 )
 from ..util import plural_s as ps
-from .common import DEFAULT_USER_AGENT, TaskContext, WorkflowTask
+from .common import NoneType, TaskContext, WorkflowTask
 
 if TYPE_CHECKING:  # Imported by type checkers, but prevent circular includes
     from yabs.task_runner import TaskInstance
@@ -40,20 +38,22 @@ class GithubReleaseTask(WorkflowTask):
         "upload": None,
     }
     MANDATORY_OPTS = None
+    OPT_TYPES = {
+        "draft": bool,
+        "gh_auth": (dict, str, NoneType),
+        "message": str,
+        "name": str,
+        "prerelease": (bool, NoneType),
+        "repo": (str, NoneType),
+        "tag": (str, NoneType),
+        "target_commitish": (str, NoneType),
+        "upload": (list, NoneType),
+    }
 
     def __init__(self, task_inst: "TaskInstance"):
         super().__init__(task_inst)
 
         opts = self.opts
-        check_arg(opts["draft"], bool)
-        check_arg(opts["gh_auth"], (dict, str), or_none=True)
-        check_arg(opts["message"], str)
-        check_arg(opts["name"], str)
-        check_arg(opts["prerelease"], bool, or_none=True)
-        check_arg(opts["repo"], str, or_none=True)
-        check_arg(opts["tag"], str, or_none=True)
-        check_arg(opts["target_commitish"], str, or_none=True)
-        check_arg(opts["upload"], list, or_none=True)
 
         upload = opts["upload"]
         if upload:
@@ -88,6 +88,9 @@ class GithubReleaseTask(WorkflowTask):
         return True
 
     def run(self, context: TaskContext):
+        # PyGithub is slow to import, so don't load it on every CLI start
+        from github import GithubObject, UnknownObjectException
+
         opts = self.opts
         cli_arg = self.cli_arg
 
@@ -95,13 +98,19 @@ class GithubReleaseTask(WorkflowTask):
             log_warning("`--no-release` was passed: skipping 'github_release' task.")
             return True
 
-        # TODO: assert that all targets a are in context.artifacts
+        # None means 'all built targets'
         upload = opts["upload"]
         if upload is None:
-            # None means 'all built targets'
             upload = set(context.artifacts)
         else:
-            upload = set(context.artifacts)
+            missing = set(upload).difference(context.artifacts)
+            if missing:
+                log_warning(
+                    "Skipping upload of targets that were not built: {}".format(
+                        ", ".join(sorted(missing))
+                    )
+                )
+            upload = set(upload).intersection(context.artifacts)
 
         ok = True
         # GitHub access token
@@ -113,7 +122,7 @@ class GithubReleaseTask(WorkflowTask):
                 token = auth
         else:
             token = context.gh_auth_token
-        gh = Github(token, user_agent=DEFAULT_USER_AGENT)
+        gh = context.get_github_client(token)
 
         repo_name = opts.get("repo") or context.repo
         if not repo_name or "/" not in repo_name:
@@ -128,11 +137,11 @@ class GithubReleaseTask(WorkflowTask):
             log_error("Please run 'tag' task first, to create a new tag.")
             return False
 
-        gh_tag = None
-        for t in repo.get_tags():
-            # print("GH tag", t)
-            if t.name == tag_name:
-                gh_tag = t
+        # Look up the tag directly, instead of paging through all tags
+        try:
+            gh_tag = repo.get_git_ref(f"tags/{tag_name}")
+        except UnknownObjectException:
+            gh_tag = None
 
         if self.dry_run:
             log_dry(f"create_git_release({gh_tag})")
@@ -158,8 +167,8 @@ class GithubReleaseTask(WorkflowTask):
                     "Tag '{}': assuming prerelease={}".format(tag_name, prerelease)
                 )
 
-        name = opts["name"].format(**vars(context))
-        message = opts["message"].format(**vars(context))
+        name = self.format_opt("name", context)
+        message = self.format_opt("message", context)
 
         # gh_tag = repo.get_git_tag()
         gh_release = repo.create_git_release(
@@ -172,23 +181,21 @@ class GithubReleaseTask(WorkflowTask):
         )
 
         artifacts = context.artifacts
-        for target, path in artifacts.items():
-            if upload and target not in upload:
-                continue
-
-            gh_asset = gh_release.upload_asset(
-                str(path),
-                label="",
-                # content_type=NotSet,
-                # name=NotSet,
-            )
-            log_ok(f"Upload asset {gh_asset}")
+        upload_paths = [path for target, path in artifacts.items() if target in upload]
+        # Uploads are mostly waiting for network IO, so use multiple connections
+        with ThreadPoolExecutor(max_workers=max(1, min(4, len(upload_paths)))) as ex:
+            futures = [
+                ex.submit(gh_release.upload_asset, str(path), label="")
+                for path in upload_paths
+            ]
+            for fut in as_completed(futures):
+                log_ok(f"Upload asset {fut.result()}")
 
         if ok:
             url = f"https://github.com/{context.repo}/releases/tag/{context.tag_name}"
 
             self.task_inst.task_runner.add_summary(
-                f"Created GitHub release with {len(artifacts)} artifact{ps(context.artifacts)} "
+                f"Created GitHub release with {len(upload_paths)} artifact{ps(upload_paths)} "
                 f"at {url}"
             )
         return ok
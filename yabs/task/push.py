@@ -3,13 +3,11 @@
 # Licensed under the MIT license: https://www.opensource.org/licenses/mit-license.php
 """
 """
-import os
 from typing import TYPE_CHECKING
 
-from git import Repo
 from git.exc import GitCommandError
 
-from ..util import check_arg, log_response
+from ..util import assert_always, log_response
 from .common import TaskContext, WorkflowTask
 
 if TYPE_CHECKING:  # Imported by type checkers, but prevent circular includes
@@ -22,13 +20,10 @@ class PushTask(WorkflowTask):
         "tags": False,  # Also push tags
     }
     MANDATORY_OPTS = None
-
-    def __init__(self, task_inst: "TaskInstance"):
-        super().__init__(task_inst)
-
-        opts = self.opts
-        check_arg(opts["target"], str)
-        check_arg(opts["tags"], bool)
+    OPT_TYPES = {
+        "target": str,
+        "tags": bool,
+    }
 
     # def to_str(self, context :TaskContext):
     #     add = self.opts["add"] or self.opts["add_known"]
@@ -47,24 +42,20 @@ class PushTask(WorkflowTask):
     def run(self, context: TaskContext):
         opts = self.opts
         target = self.opts["target"]
-        repo_path = os.path.abspath(".")
-        repo = Repo(repo_path)
+        # Re-use the repo that was opened by `TaskContext.initialize()`
+        assert_always(context.repo_obj is not None, "Missing `context.repo_obj`")
+        repo = context.repo_obj
         git = repo.git
 
+        # Without a target, `git push` uses the configured upstream
+        args = [target] if target else []
         try:
-            if target:
-                res = git.push(
-                    opts["target"],
-                    follow_tags=opts["tags"],
-                    dry_run=self.dry_run,
-                    verbose=self.verbose >= 4,
-                )
-            else:
-                res = git.push(
-                    follow_tags=opts["tags"],
-                    dry_run=self.dry_run,
-                    verbose=self.verbose >= 4,
-                )
+            res = git.push(
+                *args,
+                follow_tags=opts["tags"],
+                dry_run=self.dry_run,
+                verbose=self.verbose >= 4,
+            )
             log_response("git push", res, "info", self.dry_run)
         except GitCommandError as e:
             log_response("git push", "{}".format(e), "error", self.dry_run)
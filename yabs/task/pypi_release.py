@@ -5,8 +5,8 @@
 """
 from typing import TYPE_CHECKING
 
-from ..util import ConfigError, check_arg, log_dry, log_info, log_warning
-from .common import TaskContext, WorkflowTask
+from ..util import ConfigError, log_dry, log_info, log_warning
+from .common import NoneType, TaskContext, WorkflowTask
 
 if TYPE_CHECKING:  # Imported by type checkers, but prevent circular includes
     from yabs.task_runner import TaskInstance
@@ -19,6 +19,9 @@ class PypiReleaseTask(WorkflowTask):
         # "ignore_errors": False,
     }
     MANDATORY_OPTS = None
+    OPT_TYPES = {
+        "upload": (list, NoneType),
+    }
 
     # PyPI does not accept MSI, etc.
     KNOWN_PYPI_TARGETS = frozenset(("sdist", "bdist_wheel"))
@@ -27,7 +30,6 @@ class PypiReleaseTask(WorkflowTask):
         super().__init__(task_inst)
 
         opts = self.opts
-        check_arg(opts["upload"], list, or_none=True)
 
         if opts["upload"] is not None:
             unknown = set(opts["upload"]).difference(self.KNOWN_PYPI_TARGETS)
@@ -70,28 +72,40 @@ class PypiReleaseTask(WorkflowTask):
         if upload is None:
             upload = self.KNOWN_PYPI_TARGETS
 
-        for target, path in context.artifacts.items():
-            if target not in upload:
-                log_info(f"Skipping PyPI upload for unsupported distribution {path}")
-                continue
-
-            if self.dry_run:
-                log_dry(f"twine upload {path}")
-            else:
-                args = [
-                    "twine",
-                    "upload",
-                    "--non-interactive",
-                    "--verbose",
-                    # "--skip-existing",
-                    "--disable-progress-bar",
-                ]
-                if opts["comment"]:
-                    args.extend(["--comment", f"{opts['comment']}"])
-                args.append(str(path))
-
-                ret_code, _out = self._exec(args)
-                ok = ok and (ret_code == 0)
+        artifacts = context.artifacts
+        paths = [str(path) for target, path in artifacts.items() if target in upload]
+        unsupported = [
+            str(path) for target, path in artifacts.items() if target not in upload
+        ]
+        if unsupported:
+            log_info(
+                "Skipping PyPI upload for unsupported distributions: {}".format(
+                    ", ".join(unsupported)
+                )
+            )
+        if not paths:
+            log_info("No PyPI-compatible artifacts to upload: skipping.")
+            return True
+
+        if self.dry_run:
+            log_dry(f"twine upload {' '.join(paths)}")
+        else:
+            # Upload all files with one call, so twine is only started once
+            args = [
+                "twine",
+                "upload",
+                "--non-interactive",
+                "--verbose",
+                # "--skip-existing",
+                "--disable-progress-bar",
+            ]
+            if opts["comment"]:
+                args.extend(["--comment", f"{opts['comment']}"])
+            args.extend(paths)
+
+            ret_code, _out = self._exec(args)
+            ok = ret_code == 0
+
         if ok and not self.dry_run:
             package_name = context.repo_short  # TODO: allow to override
             url = f"https://pypi.org/project/{package_name}/{context.tag_name}"
@@ -3,13 +3,11 @@
 # Licensed under the MIT license: https://www.opensource.org/licenses/mit-license.php
 """
 """
-import os
 from typing import TYPE_CHECKING
 
-from git import Repo
 from git.exc import GitCommandError
 
-from ..util import check_arg, log_dry, log_response
+from ..util import assert_always, log_dry, log_response
 from .common import TaskContext, WorkflowTask
 
 if TYPE_CHECKING:  # Imported by type checkers, but prevent circular includes
@@ -22,13 +20,10 @@ class TagTask(WorkflowTask):
         "message": "Version {version}",
     }
     MANDATORY_OPTS = None
-
-    def __init__(self, task_inst: "TaskInstance"):
-        super().__init__(task_inst)
-
-        opts = self.opts
-        check_arg(opts["name"], str)
-        check_arg(opts["message"], str)
+    OPT_TYPES = {
+        "name": str,
+        "message": str,
+    }
 
     # def to_str(self, context :TaskContext):
     #     add = self.opts["add"] or self.opts["add_known"]
@@ -45,12 +40,11 @@ class TagTask(WorkflowTask):
         return True
 
     def run(self, context: TaskContext):
-        opts = self.opts
-        name = opts["name"].format(**vars(context))
-        message = opts["message"].format(**vars(context))
+        name = self.format_opt("name", context)
+        message = self.format_opt("message", context)
 
-        repo_path = os.path.abspath(".")
-        repo = Repo(repo_path)
+        assert_always(context.repo_obj is not None, "Missing `context.repo_obj`")
+        repo = context.repo_obj
         git = repo.git
 
         if self.dry_run:
@@ -67,6 +61,7 @@ class TagTask(WorkflowTask):
             )
             log_response("git tag {}".format(name), res, "info", self.dry_run)
             context.tag_name = name
+            context.reset_version_tag_names()
         except GitCommandError as e:
             log_response("git tag", "{}".format(e), "error", self.dry_run)
             return False
@@ -9,7 +9,13 @@ from typing import TYPE_CHECKING
 import click
 
 from ..util import check_arg, log_dry, log_warning
-from .common import SkipTaskResult, TaskContext, WarningTaskResult, WorkflowTask
+from .common import (
+    NoneType,
+    SkipTaskResult,
+    TaskContext,
+    WarningTaskResult,
+    WorkflowTask,
+)
 
 if TYPE_CHECKING:  # Imported by type checkers, but prevent circular includes
     from yabs.task_runner import TaskInstance
@@ -25,16 +31,18 @@ class WingetReleaseTask(WorkflowTask):
         "assume_synced": None,  # If True, skip warning about outdated fork
     }
     MANDATORY_OPTS = {"package_id", "upload"}
+    OPT_TYPES = {
+        "gh_auth": (dict, str, NoneType),
+        "package_id": str,
+        "out": (str, NoneType),
+        "assume_synced": (bool, NoneType),
+    }
 
     def __init__(self, task_inst: "TaskInstance"):
         super().__init__(task_inst)
 
         opts = self.opts
-        check_arg(opts["gh_auth"], (dict, str), or_none=True)
-        check_arg(opts["package_id"], str)
         check_arg(opts["upload"], str, opts["upload"] == "bdist_msi")
-        check_arg(opts["out"], str, or_none=True)
-        check_arg(opts["assume_synced"], bool, or_none=True)
 
     # def to_str(self, context :TaskContext):
     #     add = self.opts["add"] or self.opts["add_known"]
@@ -94,8 +102,7 @@ class WingetReleaseTask(WorkflowTask):
         assert "v" not in str(cur_version).lower()
 
         is_prerelease = bool(cur_version and cur_version.prerelease)
-        tag_names = [tag.name.lstrip("vV") for tag in context.repo_obj.tags]
-        is_version_tagged = str(cur_version) in tag_names
+        is_version_tagged = str(cur_version) in context.get_version_tag_names()
 
         if is_prerelease:
             return WarningTaskResult(
@@ -7,16 +7,17 @@ import logging
 import math
 import os
 import re
+import string
 import sys
 import time
 import types
 import warnings
+from collections import deque
 from datetime import datetime
-from io import StringIO
 from pathlib import Path
 from shutil import rmtree
 from threading import Event, RLock, Thread
-from typing import List, Tuple, Union
+from typing import Dict, List, Set, Tuple, Union
 
 from snazzy import Snazzy, emoji, gray, green, red, yellow
 
@@ -48,11 +49,71 @@ class NO_DEFAULT:
     """Used as default parameter to distinguish from `None`."""
 
 
+class BoundedSink:
+    """Collect a byte stream (e.g. process output), but keep only the tail.
+
+    This bounds the memory used for very verbose child processes, while the
+    last `max_bytes` are still available for logging.
+
+    Example::
+
+        sink = BoundedSink()
+        sink.consume(proc.stdout)
+        log_info(sink.tail_text())
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024) -> None:
+        self.max_bytes = max_bytes
+        #: Total number of bytes that were written
+        self.total_bytes = 0
+        self._chunks = deque()
+        self._size = 0
+
+    @property
+    def truncated(self) -> bool:
+        return self.total_bytes > self.max_bytes
+
+    def write(self, chunk: bytes) -> None:
+        if not chunk:
+            return
+        self._chunks.append(chunk)
+        self._size += len(chunk)
+        self.total_bytes += len(chunk)
+        # Discard old chunks, but keep at least `max_bytes`
+        while len(self._chunks) > 1 and self._size - len(self._chunks[0]) >= (
+            self.max_bytes
+        ):
+            self._size -= len(self._chunks.popleft())
+
+    def consume(self, stream, chunk_size: int = 64 * 1024) -> None:
+        """Read a binary stream until EOF."""
+        for chunk in iter(lambda: stream.read(chunk_size), b""):
+            self.write(chunk)
+
+    def tail_bytes(self) -> bytes:
+        return b"".join(self._chunks)[-self.max_bytes :]
+
+    def tail_text(self) -> str:
+        text = self.tail_bytes().decode(errors="replace")
+        if self.truncated:
+            text = f"[... {self.total_bytes - self.max_bytes:,} bytes skipped]\n{text}"
+        return text
+
+
 def get_folder_file_names(folder):
     """Return folder files names as set."""
-    p = Path(folder)
-    name_set = set([e.name for e in p.iterdir()])
-    return name_set
+    return set(os.listdir(folder))
+
+
+def _get_folder_stats(folder) -> Dict[str, Tuple[int, int]]:
+    """Return a `{file_name: (size, mtime_ns)}` dict for all folder entries."""
+    res = {}
+    with os.scandir(folder) as it:
+        for e in it:
+            # `DirEntry.stat()` is cached (and free on Windows)
+            st = e.stat()
+            res[e.name] = (st.st_size, st.st_mtime_ns)
+    return res
 
 
 class FolderContentMonitor:
@@ -67,8 +128,15 @@ class FolderContentMonitor:
         self.added_files = None
         self.changed_or_added_files = None
         self.changed_or_added_by_tag = None
+        #: (dict) Compiled `artifacts_def["matches"]` patterns by tag
+        self.patterns = {}
         if artifacts_def:
             self.path = Path(artifacts_def["folder"]).absolute()
+            # `re.compile()` accepts (and returns) already compiled patterns
+            self.patterns = {
+                tag: re.compile(pattern)
+                for tag, pattern in artifacts_def.get("matches", {}).items()
+            }
 
     def __enter__(self):
         path = self.path
@@ -84,9 +152,7 @@ class FolderContentMonitor:
                 log_info(f"Creating dist folder: {path}")
                 path.mkdir()
 
-        self.prev_stats = {}
-        for e in path.iterdir():
-            self.prev_stats[e.name] = e.stat()
+        self.prev_stats = _get_folder_stats(path)
         self.prev_files = set(self.prev_stats.keys())
 
         return self
@@ -98,19 +164,17 @@ class FolderContentMonitor:
         self.added_files = set()
         self.changed_or_added_files = set()
         self.changed_or_added_by_tag = {}
-        for e in self.path.iterdir():
-            cur_stat = e.stat()
-            prev_stat = self.prev_stats.get(e.name)
+        for name, stat in _get_folder_stats(self.path).items():
+            prev_stat = self.prev_stats.get(name)
             if prev_stat is None:
-                self.added_files.add(e.name)
-                self.changed_or_added_files.add(e.name)
-            elif cur_stat.st_mtime != prev_stat.st_mtime:
-                self.changed_or_added_files.add(e.name)
+                self.added_files.add(name)
+                self.changed_or_added_files.add(name)
+            elif stat != prev_stat:
+                self.changed_or_added_files.add(name)
 
         for fspec in self.changed_or_added_files:
-            for tag, pattern in self.artifacts_def["matches"].items():
-                # print("MATCH", tag, pattern, fspec)
-                if re.match(pattern, fspec):
+            for tag, pattern in self.patterns.items():
+                if pattern.match(fspec):
                     full_path = (self.path / fspec).absolute()
                     self.changed_or_added_by_tag[tag] = full_path
         return
@@ -502,6 +566,20 @@ def check_dict_keys(
     return errors
 
 
+def get_format_field_names(fmt: str) -> Set[str]:
+    """Return the top-level field names that are referenced by a format string.
+
+    Example::
+
+        get_format_field_names("v{version.major} of {repo}")  # {'version', 'repo'}
+    """
+    names = set()
+    for _literal, field_name, _spec, _conv in string.Formatter().parse(fmt):
+        if field_name:
+            names.add(re.split(r"[.\[]", field_name, 1)[0])
+    return names
+
+
 def timetag(seconds=True, *, ms=False):
     """Return a time stamp string that can be used as (part of a) filename (also sorts well)."""
     now = datetime.now()
@@ -554,6 +632,17 @@ def search_file_upward(
     return None
 
 
+def get_user_cache_dir() -> Path:
+    """Return the folder for Yabs' cache files, e.g. `~/.cache/yabs`."""
+    if os.name == "nt" and os.environ.get("LOCALAPPDATA"):
+        root = Path(os.environ["LOCALAPPDATA"])
+    elif os.environ.get("XDG_CACHE_HOME"):
+        root = Path(os.environ["XDG_CACHE_HOME"])
+    else:
+        root = Path.home() / ".cache"
+    return root / "yabs"
+
+
 def remove_directory(path, content_only=False, log=None):
     check_arg(path, (str, Path))
     check_arg(content_only, bool)
@@ -977,7 +1066,7 @@ def run_process_streamed(
 
     """
     LINE_PREFIX = " .. "
-    out = StringIO()
+    out = BoundedSink()
     pid = process.pid
     if name:
         name = f"<{pid}> {name}"
@@ -1043,8 +1132,8 @@ def run_process_streamed(
             # readline() blocks, so we process it in a separate thread.
             # Read line-by-line
             line = process.stdout.readline()
-            line = line.decode()
             out.write(line)
+            line = line.decode()
             line = line.replace("\r\n", "\n").rstrip("\n")
             lines = line.split("\n")
             with buf_lock:
@@ -1065,4 +1154,4 @@ def run_process_streamed(
 
     if local_vars["is_timed_out"]:
         log_error("{} killed (timeout: {:0.1f} seconds)".format(name, timeout))
-    return process.returncode, out.getvalue()
+    return process.returncode, out.tail_text()
@@ -20,6 +20,8 @@ if TYPE_CHECKING:  # Imported by type checkers, but prevent circular includes
 
 ORDERED_INCREMENTS = ("postrelease", "prerelease", "patch", "minor", "major")
 INCREMENTS = frozenset(ORDERED_INCREMENTS)
+#: Map increment name => rank in `ORDERED_INCREMENTS`
+INCREMENT_ORDER = {inc: idx for idx, inc in enumerate(ORDERED_INCREMENTS)}
 
 
 def copy_version(v, prerelease=None):